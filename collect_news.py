@@ -1,38 +1,46 @@
 import os
-import json
+import gzip
+import orjson
 import time
 import asyncio
 from datetime import datetime
-from nodriver_helper import NodriverBrowser, fetch_json_from_urls
+from nodriver_helper import HttpFetcher, fetch_json_from_urls, sanitize_filename
+
+# Buffer size for file I/O (larger than the 8 KB default to cut down on syscalls)
+IO_BUFFER_SIZE = 65536
+
+
+def _open_buffered(path, mode):
+    """Open a file with a 64 KB buffer."""
+    return open(path, mode, buffering=IO_BUFFER_SIZE)
+
+
+def _write_json(filepath, data):
+    """Write data to filepath as indented JSON."""
+    with _open_buffered(filepath, 'wb') as f:
+        f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+
+
+def _write_json_gz(filepath, data):
+    """Write data to filepath as compact, gzip-compressed JSON."""
+    with gzip.open(filepath, 'wb', compresslevel=3) as f:
+        f.write(orjson.dumps(data))
+
 
 async def collect_news(domains_file="townnews.txt", debug_mode=False):
     """
-    Collects news articles from a list of TownNews CMS domains using nodriver.
+    Collects news articles from a list of TownNews CMS domains over HTTP,
+    falling back to nodriver for domains that block plain requests.
 
     Args:
         domains_file: Path to file containing list of domains (default: 'townnews.txt')
         debug_mode: If True, saves ALL page content (success and error) for inspection (default: False)
     """
-    # Create the main directory for raw news data if it doesn't exist
-    if not os.path.exists("raw_news_data"):
-        os.makedirs("raw_news_data")
-
-    # Create a directory for the current date
+    # Create the output directory for this run: raw_news_data/<date>/<timestamp>
     date_str = datetime.now().strftime("%Y-%m-%d")
-    date_dir = os.path.join("raw_news_data", date_str)
-    if not os.path.exists(date_dir):
-        os.makedirs(date_dir)
-
-    # Create a directory for the current timestamp
     timestamp_str = str(int(time.time()))
-    timestamp_dir = os.path.join(date_dir, timestamp_str)
-    os.makedirs(timestamp_dir)
-
-    summary = {
-        "collection_timestamp": timestamp_str,
-        "collection_date": date_str,
-        "results": []
-    }
+    timestamp_dir = os.path.join("raw_news_data", date_str, timestamp_str)
+    os.makedirs(timestamp_dir, exist_ok=True)
 
     try:
         with open(domains_file, 'r') as f:
@@ -41,23 +49,27 @@ async def collect_news(domains_file="townnews.txt", debug_mode=False):
         print(f"Error: '{domains_file}' not found.")
         return
 
-    # Build list of URLs from domains
+    # Results are appended to a JSON Lines file as they arrive, so progress survives a crash
+    results_filepath = os.path.join(timestamp_dir, "_collection_summary.jsonl")
+
+    # Build parallel lists of URLs and output paths from domains, indexed by position
     urls = [f"https://{domain}/search/?l=100&f=json" for domain in domains]
+    filepaths = [os.path.join(timestamp_dir, sanitize_filename(domain) + ".json.gz") for domain in domains]
 
     # Define callbacks to save data as we fetch it
-    def on_success(url, data, index):
-        domain = domains[index]
+    def record_result(result):
+        results_file.write(orjson.dumps(result) + b"\n")
+        results_file.flush()
 
-        # Sanitize domain for filename
-        filename = domain.replace(".", "_") + ".json"
-        filepath = os.path.join(timestamp_dir, filename)
+    async def on_success(url, data, index):
+        domain = domains[index]
+        filepath = filepaths[index]
 
-        # Save JSON immediately
-        with open(filepath, 'w') as f:
-            json.dump(data, f, indent=2)
+        # Save compressed JSON immediately, in a worker thread so other fetches keep running
+        await asyncio.to_thread(_write_json_gz, filepath, data)
 
-        # Update summary
-        summary["results"].append({
+        # Record result
+        record_result({
             "domain": domain,
             "status": "success",
             "article_count": data.get("total", 0),
@@ -67,34 +79,43 @@ async def collect_news(domains_file="townnews.txt", debug_mode=False):
     def on_error(url, error, content, index):
         domain = domains[index]
 
-        # Update summary
-        summary["results"].append({
+        # Record result
+        record_result({
             "domain": domain,
             "status": "error",
             "error_message": error
         })
 
-    # Use context manager for browser lifecycle
-    async with NodriverBrowser() as browser:
-        # Fetch all URLs using single browser instance with callbacks
-        await fetch_json_from_urls(
-            browser,
-            urls,
-            wait_time=3.0,
-            selector='body',
-            selector_timeout=10.0,
-            delay_range=(3.0, 15.0),
-            debug_dir="debug_pages",
-            on_success=on_success,
-            on_error=on_error,
-            progress_desc="Collecting news",
-            debug_mode=debug_mode
-        )
-
-    # Write summary file
+    with open(results_filepath, 'ab') as results_file:
+        # Use context manager for session (and fallback browser) lifecycle
+        async with HttpFetcher() as fetcher:
+            # Fetch all URLs concurrently over a single session with callbacks
+            await fetch_json_from_urls(
+                fetcher,
+                urls,
+                wait_time=3.0,
+                selector='body',
+                selector_timeout=10.0,
+                delay_range=(3.0, 15.0),
+                debug_dir="debug_pages",
+                on_success=on_success,
+                on_error=on_error,
+                progress_desc="Collecting news",
+                debug_mode=debug_mode
+            )
+
+    # Write summary file, combining the recorded results
+    with _open_buffered(results_filepath, 'rb') as f:
+        results = [orjson.loads(line) for line in f]
+
+    summary = {
+        "collection_timestamp": timestamp_str,
+        "collection_date": date_str,
+        "results": results
+    }
+
     summary_filepath = os.path.join(timestamp_dir, "_collection_summary.json")
-    with open(summary_filepath, 'w') as f:
-        json.dump(summary, f, indent=2)
+    _write_json(summary_filepath, summary)
 
     print(f"\nCollection complete. Summary written to {summary_filepath}")
 
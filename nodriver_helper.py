@@ -1,14 +1,16 @@
 """
-Nodriver Helper - Browser automation utilities for fetching JSON from URLs
+Nodriver Helper - HTTP and browser automation utilities for fetching JSON from URLs
 
 USAGE BEST PRACTICES:
 
-This module is designed to process URLs sequentially in a single browser instance,
-which is more efficient and stable than opening multiple tabs concurrently.
+This module fetches URLs concurrently over a single pooled aiohttp session.
+The JSON endpoints don't need a browser to render them, so plain HTTP is used
+first and a nodriver browser is only started (once, lazily) for URLs that fail
+over HTTP - e.g. a 403 or a bot-challenge page instead of JSON.
 
 RECOMMENDED APPROACH:
     1. Create a single list of all URLs you need to fetch
-    2. Use NodriverBrowser context manager to create one browser instance
+    2. Use HttpFetcher context manager to create one session (and at most one browser)
     3. Call fetch_json_from_urls once with all URLs and callbacks
     4. Handle results in callbacks (on_success, on_error) as they arrive
     5. Dynamic pagination: Add new URLs to the list inside callbacks if needed
@@ -27,41 +29,59 @@ Example:
     def on_error(url, error, content, index):
         print(f"Failed to fetch {url}: {error}")
 
-    async with NodriverBrowser() as browser:
+    async with HttpFetcher() as fetcher:
         await fetch_json_from_urls(
-            browser,
+            fetcher,
             urls,
             on_success=on_success,
             on_error=on_error
         )
 
 AVOID THIS ANTI-PATTERN:
-    # DON'T create concurrent tasks that all use the browser at once
-    # This opens too many tabs simultaneously and can crash the browser
+    # DON'T create your own concurrent tasks around fetch_json_from_urls
+    # Concurrency and politeness are already handled inside it
 
-    async with NodriverBrowser() as browser:
-        tasks = [fetch_domain(browser, domain) for domain in domains]
-        results = await asyncio.gather(*tasks)  # BAD: Opens all tabs at once!
+    async with HttpFetcher() as fetcher:
+        tasks = [fetch_json_from_urls(fetcher, [url]) for url in urls]
+        results = await asyncio.gather(*tasks)  # BAD: Bypasses the concurrency limit and per-host delays!
 
-WHY SEQUENTIAL IS BETTER:
-    - Only one tab open at a time (lower memory usage)
-    - Built-in delays between requests (polite to servers)
-    - Better error handling and recovery
+WHY ONE CALL IS BETTER:
+    - Requests run concurrently, bounded by a semaphore (max_concurrency)
+    - Random delays are applied per host, so different sites don't wait on each other
+    - The browser fallback is serialized (only one tab open at a time)
     - Dynamic pagination support
     - Progress tracking with tqdm
     - Proper resource cleanup
 """
 
 import nodriver as uc
+import aiohttp
 import asyncio
-import json
+import inspect
+import orjson
 import random
 import os
 import re
+import time
 from typing import List, Dict, Optional, Tuple, Callable, Any
+from urllib.parse import urlsplit
 from tqdm import tqdm
 
 
+# Headers sent with every request on the shared session
+DEFAULT_HEADERS = {
+    "Connection": "keep-alive",
+    "User-Agent": "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0 Safari/537.36",
+    "Accept": "application/json"
+}
+
+# Matches JSON embedded in an HTML page as <script type="application/json">...</script>
+_JSON_SCRIPT_RE = re.compile(r'<script[^>]*application/json[^>]*>(.*?)</script>', re.DOTALL | re.IGNORECASE)
+
+# HTTP statuses that suggest bot blocking or a challenge, so the browser fallback is tried
+BROWSER_FALLBACK_STATUSES = {403, 429, 503}
+
+
 class NodriverBrowser:
     """
     Context manager for nodriver browser lifecycle management.
@@ -69,7 +89,7 @@ class NodriverBrowser:
 
     Usage:
         async with NodriverBrowser() as browser:
-            results = await fetch_json_from_urls(browser, urls)
+            content = await fetch_content_with_browser(browser, url)
     """
 
     def __init__(self):
@@ -88,6 +108,59 @@ class NodriverBrowser:
         return False
 
 
+class HttpFetcher:
+    """
+    Context manager for a pooled aiohttp session, with a nodriver browser
+    started lazily as a fallback for URLs that can't be fetched over plain HTTP.
+    The session (and its keep-alive connections) lives for the whole context, so
+    repeat requests to a host reuse the existing TCP/TLS connection.
+    Ensures both are cleaned up even if errors occur.
+
+    Usage:
+        async with HttpFetcher() as fetcher:
+            results = await fetch_json_from_urls(fetcher, urls)
+    """
+
+    def __init__(self, request_timeout: float = 30.0):
+        self.request_timeout = request_timeout
+        self.session = None
+        self._browser_manager = None
+        self._browser = None
+        self._browser_lock = asyncio.Lock()
+
+    async def __aenter__(self):
+        self.session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=64,
+                limit_per_host=4,
+                keepalive_timeout=85,
+                enable_cleanup_closed=True
+            ),
+            headers=DEFAULT_HEADERS,
+            timeout=aiohttp.ClientTimeout(total=self.request_timeout)
+        )
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        if self.session:
+            try:
+                await self.session.close()
+            except Exception:
+                pass  # Ignore errors when closing session
+        if self._browser_manager:
+            await self._browser_manager.__aexit__(exc_type, exc_val, exc_tb)
+        return False
+
+    async def get_browser(self):
+        """
+        Return the fallback browser, starting it on first use.
+        """
+        if self._browser is None:
+            self._browser_manager = NodriverBrowser()
+            self._browser = await self._browser_manager.__aenter__()
+        return self._browser
+
+
 def sanitize_filename(text: str) -> str:
     """
     Sanitize text for use in filenames by replacing problematic characters.
@@ -101,10 +174,19 @@ def sanitize_filename(text: str) -> str:
     return text.replace(".", "_").replace("/", "_").replace(":", "_")
 
 
+def _error_message(error: Exception) -> str:
+    """
+    Describe an exception for on_error and result entries. Some exceptions (e.g.
+    asyncio.TimeoutError) have no message, so their type name is used instead.
+    """
+    return str(error) or type(error).__name__
+
+
 def extract_json_from_content(content: str) -> dict:
     """
     Extract JSON from page content. Tries pure JSON first, then falls back
-    to extracting JSON embedded in HTML content.
+    to extracting JSON embedded in HTML content (a JSON script tag, then the
+    page with its wrapping tags stripped, then the outermost brackets).
 
     Args:
         content: Raw page content (JSON or HTML with embedded JSON)
@@ -114,14 +196,23 @@ def extract_json_from_content(content: str) -> dict:
 
     Raises:
         ValueError: If JSON cannot be extracted or parsed
-        json.JSONDecodeError: If JSON is malformed
+        orjson.JSONDecodeError: If JSON is malformed (a ValueError subclass)
     """
     try:
         # First, assume content is pure JSON
-        return json.loads(content)
-    except json.JSONDecodeError:
+        return orjson.loads(content)
+    except orjson.JSONDecodeError:
+        # Look for JSON embedded in a script tag
+        match = _JSON_SCRIPT_RE.search(content)
+        if match:
+            try:
+                return orjson.loads(match.group(1))
+            except orjson.JSONDecodeError:
+                pass  # Fall through to stripping the HTML
+
         # Check if content is wrapped in HTML tags
-        if content.strip().startswith('<html') or content.strip().startswith('<!DOCTYPE'):
+        stripped = content.strip()
+        if stripped.startswith('<html') or stripped.startswith('<!DOCTYPE'):
             # Strip HTML tags from start and end using regex
             # Remove opening tags from the beginning
             cleaned = re.sub(r'^(<[^>]+>)+', '', content, flags=re.MULTILINE | re.DOTALL)
@@ -130,11 +221,11 @@ def extract_json_from_content(content: str) -> dict:
             cleaned = cleaned.strip()
 
             try:
-                return json.loads(cleaned)
-            except json.JSONDecodeError:
+                return orjson.loads(cleaned)
+            except orjson.JSONDecodeError:
                 pass  # Fall through to manual extraction
 
-        # Final fallback: manually find first { or [ to last } or ]
+        # Last resort: manually find first { or [ to last } or ]
         # Check for JSON array first
         array_start = content.find('[')
         array_end = content.rfind(']') + 1
@@ -147,16 +238,72 @@ def extract_json_from_content(content: str) -> dict:
         if array_start != -1 and (obj_start == -1 or array_start < obj_start):
             if array_end > array_start:
                 json_str = content[array_start:array_end]
-                return json.loads(json_str)
+                return orjson.loads(json_str)
         elif obj_start != -1 and obj_end > obj_start:
             json_str = content[obj_start:obj_end]
-            return json.loads(json_str)
+            return orjson.loads(json_str)
 
         raise ValueError("Could not extract JSON from page content.")
 
 
-async def fetch_json_from_urls(
+def save_debug_content(debug_dir: str, url: str, content: str, suffix: str):
+    """
+    Save raw page content to the debug directory for inspection.
+
+    Args:
+        debug_dir: Existing directory to save the page content in
+        url: URL the content was fetched from (used to build the filename)
+        content: Raw page content
+        suffix: Filename suffix, e.g. 'success' or 'error'
+    """
+    # Create safe filename from URL
+    safe_name = sanitize_filename(url)
+    debug_path = os.path.join(debug_dir, f"{safe_name}_{suffix}.html")
+
+    with open(debug_path, "w") as f:
+        f.write(content)
+
+
+async def fetch_content_with_browser(
     browser,
+    url: str,
+    wait_time: float = 3.0,
+    selector: str = 'body',
+    selector_timeout: float = 10.0
+) -> str:
+    """
+    Fetch raw page content for a single URL with the browser.
+    The URL is loaded in the browser's main tab, which is reused across calls so
+    the browser's connection pool survives between fallback fetches.
+
+    Args:
+        browser: Active nodriver browser instance
+        url: URL to fetch
+        wait_time: Seconds to wait after page load (default: 3.0)
+        selector: CSS selector to wait for (default: 'body')
+        selector_timeout: Timeout for selector wait in seconds (default: 10.0)
+
+    Returns:
+        Raw page content as a string
+    """
+    # Load URL in the existing tab
+    page = await browser.get(url)
+
+    # Wait for page to load
+    await page.sleep(wait_time)
+
+    # Try to wait for selector (continue even if it times out)
+    try:
+        await page.select(selector, timeout=selector_timeout)
+    except Exception:
+        pass  # Continue even if selector times out
+
+    # Get page content
+    return await page.get_content()
+
+
+async def fetch_json_from_urls(
+    fetcher: HttpFetcher,
     urls: List[str],
     wait_time: float = 3.0,
     selector: str = 'body',
@@ -166,112 +313,173 @@ async def fetch_json_from_urls(
     on_success: Optional[Callable[[str, dict, int], Any]] = None,
     on_error: Optional[Callable[[str, str, Optional[str], int], Any]] = None,
     progress_desc: str = "Fetching URLs",
-    debug_mode: bool = False
+    debug_mode: bool = False,
+    max_concurrency: int = 16
 ) -> List[Dict]:
     """
-    Fetch and parse JSON content from multiple URLs using a single browser instance.
-    Each URL is opened in a new tab for isolation, then closed after processing.
+    Fetch and parse JSON content from multiple URLs concurrently.
+    Each URL is requested over the fetcher's HTTP session; if the site blocks it
+    (a status in BROWSER_FALLBACK_STATUSES, or a successful response that isn't JSON
+    such as a bot challenge) the URL is retried once in the fetcher's browser. Other
+    failures (e.g. 404s, DNS errors, timeouts) are reported through on_error directly.
     Results are saved immediately via callbacks as they are fetched.
 
     Args:
-        browser: Active nodriver browser instance
+        fetcher: Active HttpFetcher instance
         urls: List of URLs to fetch
-        wait_time: Seconds to wait after page load (default: 3.0)
-        selector: CSS selector to wait for (default: 'body')
+        wait_time: Seconds to wait after page load in the browser fallback (default: 3.0)
+        selector: CSS selector to wait for in the browser fallback (default: 'body')
         selector_timeout: Timeout for selector wait in seconds (default: 10.0)
-        delay_range: Tuple of (min, max) seconds for random delay between requests (default: 3-15)
+        delay_range: Tuple of (min, max) seconds for random delay between requests to the same host (default: 3-15)
         debug_dir: Directory to save failed page content for debugging (default: 'debug_pages', None to disable)
-        on_success: Callback function(url, data, index) called immediately when URL is successfully fetched
-        on_error: Callback function(url, error, content, index) called immediately when URL fetch fails
+        on_success: Callback function(url, data, index) called immediately when URL is successfully fetched.
+            May be a coroutine function, in which case it runs as a background task so the
+            next fetches aren't held up (e.g. by a file write)
+        on_error: Callback function(url, error, content, index) called immediately when URL fetch fails.
+            May be a coroutine function, as with on_success
         progress_desc: Description for the progress bar (default: 'Fetching URLs')
         debug_mode: If True, saves ALL page content (success and error) for inspection (default: False)
+        max_concurrency: Maximum number of requests in flight at once (default: 16)
 
     Returns:
-        List of result dictionaries, one per URL:
+        List of result dictionaries, one per URL, in the same order as urls:
         - Success: {"url": str, "status": "success", "data": dict}
         - Error: {"url": str, "status": "error", "error": str, "content": str (optional)}
     """
-    results = []
-
-    for i, url in tqdm(enumerate(urls), total=len(urls), desc=progress_desc, unit="url"):
-        page = None
-        content = None
-
+    # Create the debug directory once up front
+    if debug_dir:
+        os.makedirs(debug_dir, exist_ok=True)
+
+    semaphore = asyncio.Semaphore(max_concurrency)
+    host_locks = {}
+    last_hit = {}
+    pending_callbacks = []
+    progress = tqdm(total=len(urls), desc=progress_desc, unit="url")
+
+    async def settle_callback(outcome, result, i):
+        # A failing async callback is reported like a failed fetch, instead of its
+        # exception escaping the gather below and aborting the whole call
         try:
-            # Open URL in new tab for isolation
-            page = await browser.get(url, new_tab=True)
-
-            # Wait for page to load
-            await page.sleep(wait_time)
-
-            # Try to wait for selector (continue even if it times out)
-            try:
-                await page.select(selector, timeout=selector_timeout)
-            except Exception:
-                pass  # Continue even if selector times out
-
-            # Get page content
-            content = await page.get_content()
-
-            # Parse JSON from content
-            data = extract_json_from_content(content)
-
-            # Save debug content in debug mode (even on success)
-            if debug_mode and debug_dir and content:
-                if not os.path.exists(debug_dir):
-                    os.makedirs(debug_dir)
-
-                safe_name = sanitize_filename(url)
-                debug_path = os.path.join(debug_dir, f"{safe_name}_success.html")
-
-                with open(debug_path, "w") as f:
-                    f.write(content)
-
-            # Call success callback immediately if provided
-            if on_success:
-                on_success(url, data, i)
+            await outcome
+        except Exception as e:
+            if result["status"] != "success":
+                print(f"Error callback failed for {result['url']}: {e}")
+                return
+            del result["data"]
+            error = _error_message(e)
+            result.update(status="error", error=error, content=None)
+            if on_error:
+                run_callback(on_error, result, i, result["url"], error, None, i)
 
-            results.append({
-                "url": url,
-                "status": "success",
-                "data": data
-            })
+    def run_callback(callback, result, i, *args):
+        # Async callbacks are scheduled rather than awaited, so fetching continues meanwhile
+        outcome = callback(*args)
+        if inspect.isawaitable(outcome):
+            pending_callbacks.append(asyncio.ensure_future(settle_callback(outcome, result, i)))
 
-        except Exception as e:
-            # Save debug content if enabled and content was captured
-            if debug_dir and content:
-                if not os.path.exists(debug_dir):
-                    os.makedirs(debug_dir)
+    async def fetch_one(i, url):
+        content = None
 
-                # Create safe filename from URL
-                safe_name = sanitize_filename(url)
-                debug_path = os.path.join(debug_dir, f"{safe_name}_error.html")
+        # Requests to the same host are serialized and spaced out by a random delay,
+        # while requests to other hosts proceed concurrently
+        host = urlsplit(url).hostname
+        host_lock = host_locks.setdefault(host, asyncio.Lock())
 
-                with open(debug_path, "w") as f:
-                    f.write(content)
+        async with host_lock:
+            # Only wait if this host was hit recently; the first request to a host goes out immediately
+            if host in last_hit:
+                delay = random.uniform(delay_range[0], delay_range[1])
+                wait = last_hit[host] + delay - time.monotonic()
+                if wait > 0:
+                    await asyncio.sleep(wait)
 
-            # Call error callback immediately if provided
-            if on_error:
-                on_error(url, str(e), content, i)
-
-            results.append({
-                "url": url,
-                "status": "error",
-                "error": str(e),
-                "content": content if content else None
-            })
-
-        finally:
-            # Close the tab
-            if page:
+            try:
+                needs_browser = False
                 try:
-                    await page.close()
-                except Exception:
-                    pass  # Ignore errors when closing page
+                    async with semaphore:
+                        async with fetcher.session.get(url) as response:
+                            response.raise_for_status()
+                            content = await response.text()
+                except aiohttp.ClientResponseError as e:
+                    # Only block/challenge responses are worth retrying in the browser;
+                    # other errors (404, DNS failures, timeouts) are reported directly
+                    if e.status not in BROWSER_FALLBACK_STATUSES:
+                        raise
+                    needs_browser = True
+                else:
+                    try:
+                        data = extract_json_from_content(content)
+                    except ValueError:
+                        needs_browser = True  # Successful response that isn't JSON, e.g. a challenge page
+
+                if needs_browser:
+                    # Fall back to the browser for this URL only (one tab at a time)
+                    async with fetcher._browser_lock:
+                        browser = await fetcher.get_browser()
+                        content = await fetch_content_with_browser(
+                            browser,
+                            url,
+                            wait_time=wait_time,
+                            selector=selector,
+                            selector_timeout=selector_timeout
+                        )
+                    data = extract_json_from_content(content)
+
+                # Save debug content in debug mode (even on success)
+                if debug_mode and debug_dir and content:
+                    save_debug_content(debug_dir, url, content, "success")
+
+                result = {
+                    "url": url,
+                    "status": "success",
+                    "data": data
+                }
+
+                # Call success callback immediately if provided
+                if on_success:
+                    run_callback(on_success, result, i, url, data, i)
+
+            except Exception as e:
+                # Save debug content if enabled and content was captured
+                if debug_dir and content:
+                    save_debug_content(debug_dir, url, content, "error")
+
+                error = _error_message(e)
+                result = {
+                    "url": url,
+                    "status": "error",
+                    "error": error,
+                    "content": content if content else None
+                }
+
+                # Call error callback immediately if provided
+                if on_error:
+                    run_callback(on_error, result, i, url, error, content, i)
+
+            last_hit[host] = time.monotonic()
+            progress.update(1)
+
+        return result
 
-            # Apply random delay between requests (but not after the last one)
-            if i < len(urls) - 1:
-                delay = random.uniform(delay_range[0], delay_range[1])
-                await asyncio.sleep(delay)
+    results = []
+
+    try:
+        # Callbacks may append more URLs (pagination), so keep going until none are left
+        while len(results) < len(urls):
+            start = len(results)
+            progress.total = len(urls)
+            progress.refresh()
+            results.extend(await asyncio.gather(
+                *[fetch_one(i, urls[i]) for i in range(start, len(urls))]
+            ))
+
+            # Let scheduled callbacks finish, since they may also add URLs
+            # (or schedule on_error for a failed on_success)
+            while pending_callbacks:
+                scheduled = pending_callbacks[:]
+                pending_callbacks.clear()
+                await asyncio.gather(*scheduled)
+    finally:
+        progress.close()
 
     return results
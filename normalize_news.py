@@ -1,30 +1,248 @@
 import os
-import json
+import orjson
+import ijson
 import html
 import re
 import hashlib
-from datetime import datetime
-from pathlib import Path
+import sys
+import time
+import gzip
+import multiprocessing
+import shutil
+import tempfile
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import List, Optional
 from dateutil import parser as date_parser
 
-from markdownify import markdownify as md
+from markdownify import MarkdownConverter
 
+try:
+    import blake3
+except ImportError:
+    blake3 = None  # Only needed for hash_algorithm="blake3"
 
-def get_url_hash(url):
+try:
+    import fcntl
+except ImportError:
+    fcntl = None  # Not available on Windows; domain stores are then written without locking
+
+# Shared converter, so options aren't re-parsed for every article.
+# Always uses html.parser: lxml is faster but handles whitespace and unclosed tags
+# differently, so the output would depend on what happens to be installed
+_MD_CONVERTER = MarkdownConverter(heading_style="ATX", bs4_options={"features": "html.parser"})
+
+# Matches HTML tags or entities; text without either doesn't need converting to Markdown
+_HTML_MARKUP_RE = re.compile(r'<[a-zA-Z/!]|&#?\w+;')
+
+# Common HTML entities and their decoded text (matching html.unescape)
+_COMMON_ENTITIES = {
+    '&amp;': '&',
+    '&lt;': '<',
+    '&gt;': '>',
+    '&quot;': '"',
+    '&#39;': "'",
+    '&nbsp;': '\xa0'
+}
+_COMMON_ENTITY_RE = re.compile('|'.join(map(re.escape, _COMMON_ENTITIES)))
+
+# Matches a unix timestamp (10 digits) directory component in a raw data path
+_TIMESTAMP_DIR_RE = re.compile(r'(?:^|[/\\])(\d{10})[/\\]')
+
+# Smallest starttime["utc"] trusted as a millisecond timestamp (10**11 ms is early 1973)
+_MIN_UTC_MILLIS = 10**11
+
+# Translation table for turning a raw data filename back into its domain
+_UNDERSCORE_TO_DOT = str.maketrans("_", ".")
+
+# Per-domain article store: normalized articles appended one per line, plus an index of
+# the URL hashes already stored (fixed-width raw digests) for deduplication
+ARTICLES_FILENAME = "articles.jsonl"
+_HASH_SIZE = 16
+
+# Lock file taken while writing to a domain's store, so overlapping runs can't interleave appends
+LOCK_FILENAME = ".lock"
+
+# Hash index file for each supported hash algorithm. Each algorithm gets its own index,
+# so digests of different types are never mixed and either algorithm can be used on any run
+HASH_INDEX_FILENAMES = {
+    "md5": "hashes.bin",
+    "blake3": "hashes.blake3.bin"
+}
+
+# Number of articles per shard written by write_shards
+SHARD_SIZE = 5000
+
+# Buffer size for file I/O (larger than the 8 KB default to cut down on syscalls)
+IO_BUFFER_SIZE = 65536
+
+
+def _open_buffered(path, mode):
+    """Open a file with a 64 KB buffer."""
+    return open(path, mode, buffering=IO_BUFFER_SIZE)
+
+
+def _scan_dir(path):
+    """List a directory's entries with os.scandir, whose is_dir()/is_file() use cached file types."""
+    with os.scandir(path) as entries:
+        return list(entries)
+
+
+@contextmanager
+def _lock_domain_store(domain_dir):
+    """
+    Hold an exclusive lock on a domain's store, waiting for any other writer to finish.
+    Without fcntl (Windows) no lock is taken, so only one normalizer may run at a time.
     """
-    Generate MD5 hash of URL for use as filename.
+    with open(os.path.join(domain_dir, LOCK_FILENAME), 'wb') as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        yield
+
+
+def _open_raw(path):
+    """Open a raw data file for binary reading, decompressing .gz files transparently."""
+    if str(path).endswith(".gz"):
+        return gzip.open(path, 'rb')
+    return _open_buffered(path, 'rb')
+
+
+@lru_cache(maxsize=100_000)
+def get_url_hash(url, algorithm="md5"):
+    """
+    Generate hash of URL for identifying and deduplicating articles. Results are
+    cached, since the same URLs recur across scrapes.
 
     Args:
         url: Article URL string
+        algorithm: "md5" (the standard naming) or "blake3" (faster; requires the blake3 package)
 
     Returns:
-        MD5 hash as hex string
+        Hash as 32-character hex string
+
+    Raises:
+        ImportError: If algorithm is "blake3" and the blake3 package isn't installed
+        ValueError: If algorithm is not supported
     """
     if not url:
         return None
+    check_hash_algorithm(algorithm)
+    if algorithm == "blake3":
+        return blake3.blake3(url.encode('utf-8')).hexdigest(16)
     return hashlib.md5(url.encode('utf-8')).hexdigest()
 
 
+def check_hash_algorithm(algorithm):
+    """
+    Make sure a URL hash algorithm is supported and usable.
+
+    Raises:
+        ImportError: If algorithm is "blake3" and the blake3 package isn't installed
+        ValueError: If algorithm is not supported
+    """
+    if algorithm not in HASH_INDEX_FILENAMES:
+        raise ValueError(f"Unsupported hash algorithm: {algorithm}")
+    if algorithm == "blake3" and blake3 is None:
+        raise ImportError("hash_algorithm='blake3' requires the blake3 package (pip install blake3)")
+
+
+@dataclass(slots=True)
+class NormalizedArticle:
+    """
+    A normalized article, with the fields defined in normalized_news_standard.md.
+    Uses slots instead of a per-instance dict; orjson serializes it directly, in field order.
+    """
+    url: Optional[str]
+    title: Optional[str]
+    article_text: str
+    source_domain: str
+    publication_date: Optional[str]
+    publication_timestamp_gmt: Optional[int]
+    first_seen_timestamp_gmt: int
+    author: Optional[str]
+    keywords: List[str]
+
+
+def fast_unescape(text):
+    """
+    Decode HTML entities, same as html.unescape but faster for the common case
+    where every entity is one of a handful of common ones.
+
+    Args:
+        text: Text that may contain HTML entities
+
+    Returns:
+        Text with HTML entities decoded
+    """
+    if '&' not in text:
+        return text
+    decoded, replaced = _COMMON_ENTITY_RE.subn(lambda match: _COMMON_ENTITIES[match.group(0)], text)
+    # Fall back to the full decoder if any '&' wasn't part of a common entity
+    if replaced == text.count('&'):
+        return decoded
+    return html.unescape(text)
+
+
+def extract_text(item):
+    """
+    Extract all text from a content item, walking nested dicts and lists.
+    Uses an explicit stack rather than recursion and joins the strings once at the end.
+
+    Args:
+        item: Content item (string, dict, list, or any other JSON value)
+
+    Returns:
+        Non-empty strings found in the item, in document order, joined with spaces
+    """
+    # Parsed JSON only contains exact built-in types, so cheaper type() checks suffice
+    text_parts = []
+    stack = [item]
+    while stack:
+        current = stack.pop()
+        current_type = type(current)
+        if current_type is str:
+            if current:
+                text_parts.append(current)
+        elif current_type is dict:
+            # Push in reverse so values are popped in their original order
+            stack.extend(reversed(current.values()))
+        elif current_type is list:
+            stack.extend(reversed(current))
+    return " ".join(text_parts)
+
+
+def parse_date(date_string):
+    """
+    Parse a date string, trying the fast ISO-8601 and RFC-2822 parsers before
+    falling back to dateutil.
+
+    Args:
+        date_string: Date string (ISO-8601, RFC-2822, or any format dateutil understands)
+
+    Returns:
+        datetime object
+
+    Raises:
+        ValueError: If the date cannot be parsed
+    """
+    try:
+        return datetime.fromisoformat(date_string.replace('Z', '+00:00'))
+    except ValueError:
+        pass
+    try:
+        parsed = parsedate_to_datetime(date_string)
+    except (TypeError, ValueError):
+        return date_parser.parse(date_string)
+    # RFC 2822's "-0000" zone comes back naive, but it still means UTC (not local time)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
 def normalize_article(article_data, source_domain, scrape_timestamp):
     """
     Normalize a single article from TownNews format to standardized format.
@@ -35,52 +253,25 @@ def normalize_article(article_data, source_domain, scrape_timestamp):
         scrape_timestamp: Unix timestamp when this scrape run started
 
     Returns:
-        Dict with standardized fields
+        NormalizedArticle with standardized fields
     """
     # Extract and decode content
     content_parts = article_data.get("content", [])
     prologue = article_data.get("prologue") or ""
 
-    # Filter content parts to only include strings (some entries may be dicts or lists)
-    def extract_text(item):
-        """Recursively extract text from content items."""
-        if isinstance(item, str):
-            return item
-        elif isinstance(item, dict):
-            # Try to extract text from dict values
-            text_parts = []
-            for value in item.values():
-                if isinstance(value, str):
-                    text_parts.append(value)
-                elif isinstance(value, (list, dict)):
-                    extracted = extract_text(value)
-                    if extracted:
-                        text_parts.append(extracted)
-            return " ".join(text_parts)
-        elif isinstance(item, list):
-            # Process list items
-            text_parts = []
-            for subitem in item:
-                extracted = extract_text(subitem)
-                if extracted and isinstance(extracted, str):
-                    text_parts.append(extracted)
-            return " ".join(text_parts)
-        return ""
-
-    filtered_content = []
-    for item in content_parts:
-        text = extract_text(item)
-        if text:
-            filtered_content.append(text)
-
-    # Combine all content parts into one text
-    raw_text = prologue + " " + " ".join(filtered_content)
+    # Combine all content parts into one text (some entries may be dicts or lists)
+    raw_text = prologue + " " + extract_text(content_parts)
 
     # HTML decode the text
-    decoded_text = html.unescape(raw_text)
+    decoded_text = fast_unescape(raw_text)
 
-    # Convert HTML to Markdown
-    markdown_text = md(decoded_text, heading_style="ATX")
+    # Convert HTML to Markdown (plain text is already valid Markdown, so skip the HTML parse)
+    if not decoded_text.strip():
+        markdown_text = ""
+    elif ("<" in decoded_text or "&" in decoded_text) and _HTML_MARKUP_RE.search(decoded_text):
+        markdown_text = _MD_CONVERTER.convert(decoded_text)
+    else:
+        markdown_text = decoded_text
 
     # Extract publication date and create Unix timestamp
     starttime = article_data.get("starttime", {})
@@ -89,18 +280,24 @@ def normalize_article(article_data, source_domain, scrape_timestamp):
     # Parse to Unix timestamp (GMT)
     pub_timestamp_gmt = None
     if pub_date_original:
-        try:
-            parsed_date = date_parser.parse(pub_date_original)
-            pub_timestamp_gmt = int(parsed_date.timestamp())
-        except Exception:
-            # If parsing fails, try using the UTC timestamp directly if available
-            utc_timestamp = starttime.get("utc")
-            if utc_timestamp:
-                try:
-                    # TownNews UTC timestamps appear to be in milliseconds
-                    pub_timestamp_gmt = int(utc_timestamp) // 1000
-                except (ValueError, TypeError):
-                    pass
+        # Fast path: use the UTC timestamp directly if available, so no string parsing is needed
+        utc_timestamp = starttime.get("utc")
+        if utc_timestamp:
+            try:
+                # TownNews UTC timestamps appear to be in milliseconds; anything smaller than
+                # 10**11 (seconds, or a bogus value) isn't trusted and the date string is parsed instead
+                utc_millis = int(utc_timestamp)
+                if utc_millis > _MIN_UTC_MILLIS:
+                    pub_timestamp_gmt = utc_millis // 1000
+            except (ValueError, TypeError):
+                pass
+
+        if pub_timestamp_gmt is None:
+            try:
+                parsed_date = parse_date(pub_date_original)
+                pub_timestamp_gmt = int(parsed_date.timestamp())
+            except Exception:
+                pass  # Leave as null if the date can't be parsed
 
     # Extract authors
     authors_list = article_data.get("authors", [])
@@ -126,64 +323,136 @@ def normalize_article(article_data, source_domain, scrape_timestamp):
     else:
         author = None
 
+    # Bylines and keywords repeat heavily across articles, so keep one shared copy of each string
+    if type(author) is str:
+        author = sys.intern(author)
+
     # Combine keywords and sections into a single keywords field
     keywords_list = article_data.get("keywords", [])
     sections_list = article_data.get("sections", [])
-    # Merge both, removing duplicates while preserving order
-    all_keywords = []
-    seen = set()
-    for keyword in keywords_list + sections_list:
-        if keyword and keyword not in seen:
-            all_keywords.append(keyword)
-            seen.add(keyword)
+    # Merge both, removing empty values and duplicates while preserving order
+    all_keywords = [
+        sys.intern(keyword) if type(keyword) is str else keyword
+        for keyword in dict.fromkeys(keywords_list + sections_list) if keyword
+    ]
 
     # Build standardized article
-    normalized = {
-        "url": article_data.get("url"),
-        "title": article_data.get("title"),
-        "article_text": markdown_text,
-        "source_domain": source_domain,
-        "publication_date": pub_date_original,
-        "publication_timestamp_gmt": pub_timestamp_gmt,
-        "first_seen_timestamp_gmt": scrape_timestamp,
-        "author": author,
-        "keywords": all_keywords
-    }
+    return NormalizedArticle(
+        url=article_data.get("url"),
+        title=article_data.get("title"),
+        article_text=markdown_text,
+        source_domain=source_domain,
+        publication_date=pub_date_original,
+        publication_timestamp_gmt=pub_timestamp_gmt,
+        first_seen_timestamp_gmt=scrape_timestamp,
+        author=author,
+        keywords=all_keywords
+    )
+
+
+def load_known_hashes(domain_dir):
+    """
+    Load the URL hashes of all articles already stored for a domain.
 
-    return normalized
+    Args:
+        domain_dir: Domain subdirectory of the normalized output
 
+    Returns:
+        Dict mapping each hash algorithm (see HASH_INDEX_FILENAMES) to the set of raw 16-byte
+        URL hash digests in its index. The MD5 set also includes any legacy
+        one-file-per-article ({hash}.json) files in the directory
+    """
+    known_hashes = {}
+
+    for algorithm, index_filename in HASH_INDEX_FILENAMES.items():
+        digests = known_hashes[algorithm] = set()
+        hashes_path = os.path.join(domain_dir, index_filename)
+        if os.path.exists(hashes_path):
+            with _open_buffered(hashes_path, 'rb') as f:
+                data = f.read()
+            # Ignore a trailing partial hash left by an interrupted write
+            usable_length = len(data) - len(data) % _HASH_SIZE
+            digests.update(data[i:i + _HASH_SIZE] for i in range(0, usable_length, _HASH_SIZE))
+
+    # Articles normalized before the per-domain store was introduced (always MD5-named)
+    for entry in _scan_dir(domain_dir):
+        name = entry.name
+        if name.endswith(".json") and len(name) == _HASH_SIZE * 2 + 5:
+            try:
+                known_hashes["md5"].add(bytes.fromhex(name[:-5]))
+            except ValueError:
+                pass  # Not a hash-named article file
+
+    return known_hashes
+
+
+def repair_domain_store(domain_dir):
+    """
+    Cut off partial records left at the end of a domain's store by an interrupted run
+    (a hash index not a multiple of 16 bytes, or an article line without its newline),
+    so the next append starts on a record boundary instead of merging with the fragment.
 
-def normalize_townnews_file(input_filepath, output_dir, scrape_timestamp=None):
+    Args:
+        domain_dir: Domain subdirectory of the normalized output
     """
-    Process a single TownNews JSON file and write normalized articles to individual files.
+    for index_filename in HASH_INDEX_FILENAMES.values():
+        hashes_path = os.path.join(domain_dir, index_filename)
+        if os.path.exists(hashes_path):
+            size = os.path.getsize(hashes_path)
+            if size % _HASH_SIZE:
+                os.truncate(hashes_path, size - size % _HASH_SIZE)
+
+    articles_path = os.path.join(domain_dir, ARTICLES_FILENAME)
+    if not os.path.exists(articles_path):
+        return
+
+    with open(articles_path, 'rb+') as f:
+        end = f.seek(0, os.SEEK_END)
+
+        # Search backwards from the end for the last newline, a buffer at a time
+        position = end
+        while position > 0:
+            chunk_start = max(0, position - IO_BUFFER_SIZE)
+            f.seek(chunk_start)
+            newline = f.read(position - chunk_start).rfind(b"\n")
+            if newline != -1:
+                position = chunk_start + newline + 1
+                break
+            position = chunk_start
+
+        if position != end:
+            f.truncate(position)
+
+
+def normalize_townnews_file(input_filepath, output_dir, scrape_timestamp=None, hash_algorithm="md5"):
+    """
+    Process a single TownNews JSON file and append new normalized articles to the
+    domain's article store (articles.jsonl, with their URL hashes in the hash index
+    for hash_algorithm, see HASH_INDEX_FILENAMES). The store is locked for the duration,
+    so runs that overlap on a domain take turns.
 
     Args:
-        input_filepath: Path to the raw JSON file
+        input_filepath: Path to the raw JSON file (optionally gzip-compressed, ending in .gz)
         output_dir: Base directory for normalized output
-        scrape_timestamp: Unix timestamp when this data was scraped (extracted from directory name)
+        scrape_timestamp: Unix timestamp when this data was scraped (default: extracted from the file's path)
+        hash_algorithm: Hash used to identify new articles, "md5" or "blake3" (see get_url_hash).
+            Articles already stored under either algorithm are skipped
 
     Returns:
-        Dict with statistics: articles_new, articles_skipped, errors
+        Dict with statistics: articles_new, articles_skipped, articles_skipped_image_type, errors,
+        plus messages (list of log lines, returned rather than printed so the caller can
+        keep output from parallel workers in order)
     """
-    with open(input_filepath, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-
     # If no scrape timestamp provided, try to extract from directory structure
     # Format: raw_news_data/2025-11-20/1763657957/file.json
     if scrape_timestamp is None:
-        path_parts = Path(input_filepath).parts
-        for part in path_parts:
-            # Look for unix timestamp (10 digits)
-            if part.isdigit() and len(part) == 10:
-                scrape_timestamp = int(part)
-                break
+        match = _TIMESTAMP_DIR_RE.search(str(input_filepath))
         # Fallback to current time if not found
-        if scrape_timestamp is None:
-            scrape_timestamp = int(datetime.now().timestamp())
+        scrape_timestamp = int(match.group(1)) if match else int(time.time())
 
-    # Extract domain from filename (e.g., athensreview_com.json -> athensreview.com)
+    # Extract domain from filename (e.g., athensreview_com.json.gz -> athensreview.com)
     filename = os.path.basename(input_filepath)
-    domain = filename.replace(".json", "").replace("_", ".")
+    domain = sys.intern(filename.removesuffix(".gz").removesuffix(".json").translate(_UNDERSCORE_TO_DOT))
 
     # Create domain-specific subdirectory
     domain_dir = os.path.join(output_dir, domain)
@@ -194,56 +463,91 @@ def normalize_townnews_file(input_filepath, output_dir, scrape_timestamp=None):
         "articles_new": 0,
         "articles_skipped": 0,
         "articles_skipped_image_type": 0,
-        "errors": 0
+        "errors": 0,
+        "messages": []
     }
 
-    # Process all articles in the "rows" field
-    rows = data.get("rows", [])
-
-    for article in rows:
-        try:
-            # Skip image-only items (just photos with captions)
-            if article.get("type") == "image":
-                stats["articles_skipped_image_type"] += 1
-                continue
-
-            # Get URL hash for filename
-            url = article.get("url")
-            url_hash = get_url_hash(url)
-
-            if not url_hash:
-                stats["errors"] += 1
-                continue
-
-            # Check if article already exists
-            output_filepath = os.path.join(domain_dir, f"{url_hash}.json")
-            if os.path.exists(output_filepath):
-                stats["articles_skipped"] += 1
-                continue
-
-            # Normalize and write article
-            normalized = normalize_article(article, domain, scrape_timestamp)
-
-            with open(output_filepath, 'w', encoding='utf-8') as f:
-                json.dump(normalized, f, indent=2, ensure_ascii=False)
-
-            stats["articles_new"] += 1
+    # Fail early if the hash algorithm is unsupported or its package is missing
+    check_hash_algorithm(hash_algorithm)
+
+    with _lock_domain_store(domain_dir):
+        # Drop anything half-written by an interrupted run before appending
+        repair_domain_store(domain_dir)
+
+        # Load the hashes of already-stored articles once, so dedup is an in-memory lookup
+        known_hashes = load_known_hashes(domain_dir)
+        new_hashes = known_hashes[hash_algorithm]
+
+        # Every non-empty index is checked with its own algorithm, so articles stored
+        # before a switch of hash_algorithm are still recognized
+        other_algorithms = [
+            algorithm for algorithm, digests in known_hashes.items()
+            if digests and algorithm != hash_algorithm
+        ]
+        for algorithm in other_algorithms:
+            check_hash_algorithm(algorithm)
+
+        # Stream articles from the "rows" field one at a time rather than loading the whole file,
+        # appending new articles and their hashes to the domain's store
+        with _open_raw(input_filepath) as input_file, \
+                _open_buffered(os.path.join(domain_dir, ARTICLES_FILENAME), 'ab') as articles_file, \
+                _open_buffered(os.path.join(domain_dir, HASH_INDEX_FILENAMES[hash_algorithm]), 'ab') as hashes_file:
+            for article in ijson.items(input_file, 'rows.item', use_float=True):
+                try:
+                    # Skip image-only items (just photos with captions)
+                    if article.get("type") == "image":
+                        stats["articles_skipped_image_type"] += 1
+                        continue
+
+                    # Get URL hash for deduplication
+                    url = article.get("url")
+                    url_hash = get_url_hash(url, hash_algorithm)
+
+                    if not url_hash:
+                        stats["errors"] += 1
+                        continue
+
+                    # Check if article already exists (including under the other algorithm's hash)
+                    digest = bytes.fromhex(url_hash)
+                    if digest in new_hashes or any(
+                        bytes.fromhex(get_url_hash(url, algorithm)) in known_hashes[algorithm]
+                        for algorithm in other_algorithms
+                    ):
+                        stats["articles_skipped"] += 1
+                        continue
+
+                    # Normalize and append article, then record its hash
+                    normalized = normalize_article(article, domain, scrape_timestamp)
+
+                    # The article line is flushed before its hash, and the hash right after, so
+                    # an interrupted run leaves at most one unindexed article (normalized again
+                    # next time) and never a hash whose article is missing
+                    articles_file.write(orjson.dumps(normalized) + b"\n")
+                    articles_file.flush()
+                    hashes_file.write(digest)
+                    hashes_file.flush()
+
+                    new_hashes.add(digest)
+                    stats["articles_new"] += 1
 
-        except Exception as e:
-            print(f"Error normalizing article from {domain}: {e}")
-            stats["errors"] += 1
-            continue
+                except Exception as e:
+                    stats["messages"].append(f"Error normalizing article from {domain}: {e}")
+                    stats["errors"] += 1
+                    continue
 
     return stats
 
 
-def process_all_raw_data(raw_data_dir="raw_news_data", output_dir="../normalized_news"):
+def process_all_raw_data(raw_data_dir="raw_news_data", output_dir="../normalized_news", max_workers=None, hash_algorithm="md5"):
     """
-    Process all raw TownNews data and output normalized JSON files.
+    Process all raw TownNews data and append normalized articles to the per-domain stores.
+    Files within each timestamp directory are normalized in parallel worker processes.
 
     Args:
         raw_data_dir: Directory containing raw_news_data
         output_dir: Directory to write normalized data (one level up)
+        max_workers: Number of worker processes (default: os.cpu_count())
+        hash_algorithm: Hash used to identify articles, "md5" (default) or "blake3"
     """
     # Create output directory if it doesn't exist
     os.makedirs(output_dir, exist_ok=True)
@@ -258,65 +562,92 @@ def process_all_raw_data(raw_data_dir="raw_news_data", output_dir="../normalized
     }
 
     # Walk through all date/timestamp directories
-    for date_dir in Path(raw_data_dir).iterdir():
-        if not date_dir.is_dir():
-            continue
+    # Use forkserver where available so workers start from a clean, already-imported server process
+    start_methods = multiprocessing.get_all_start_methods()
+    mp_context = multiprocessing.get_context("forkserver") if "forkserver" in start_methods else None
 
-        for timestamp_dir in date_dir.iterdir():
-            if not timestamp_dir.is_dir():
+    with ProcessPoolExecutor(max_workers=max_workers or os.cpu_count(), mp_context=mp_context) as executor:
+        for date_dir in _scan_dir(raw_data_dir):
+            if not date_dir.is_dir():
                 continue
 
-            # Track statistics for this timestamp directory
-            timestamp_stats = {
-                "files_processed": 0,
-                "articles_new": 0,
-                "articles_skipped": 0,
-                "articles_skipped_image_type": 0,
-                "errors": 0
-            }
-
-            # Process each JSON file in the timestamp directory
-            for json_file in timestamp_dir.glob("*.json"):
-                # Skip summary files
-                if json_file.name.startswith("_"):
+            for timestamp_dir in _scan_dir(date_dir.path):
+                if not timestamp_dir.is_dir():
                     continue
 
-                try:
-                    print(f"Processing {json_file}...")
-                    file_stats = normalize_townnews_file(json_file, output_dir)
-
-                    timestamp_stats["files_processed"] += 1
-                    timestamp_stats["articles_new"] += file_stats["articles_new"]
-                    timestamp_stats["articles_skipped"] += file_stats["articles_skipped"]
-                    timestamp_stats["articles_skipped_image_type"] += file_stats["articles_skipped_image_type"]
-                    timestamp_stats["errors"] += file_stats["errors"]
-
-                    print(f"  ✓ New: {file_stats['articles_new']}, Skipped: {file_stats['articles_skipped']}, Images: {file_stats['articles_skipped_image_type']}, Errors: {file_stats['errors']}")
-
-                except Exception as e:
-                    print(f"  ✗ Error processing {json_file}: {e}")
-                    timestamp_stats["errors"] += 1
-
-            # Write summary for this timestamp directory
-            if timestamp_stats["files_processed"] > 0:
-                summary_path = timestamp_dir / "_normalization_summary.json"
-                summary = {
-                    "timestamp": datetime.now().isoformat(),
-                    "source": "townnews",
-                    "statistics": timestamp_stats
+                # Track statistics for this timestamp directory
+                timestamp_stats = {
+                    "files_processed": 0,
+                    "articles_new": 0,
+                    "articles_skipped": 0,
+                    "articles_skipped_image_type": 0,
+                    "errors": 0
                 }
 
-                with open(summary_path, 'w', encoding='utf-8') as f:
-                    json.dump(summary, f, indent=2)
-
-                print(f"  → Summary written to {summary_path}")
+                # Collect the JSON files (plain or gzipped) in the timestamp directory, skipping summary files
+                json_files = [
+                    entry.path for entry in _scan_dir(timestamp_dir.path)
+                    if entry.name.endswith((".json", ".json.gz")) and not entry.name.startswith("_") and entry.is_file()
+                ]
+
+                # The directory name is the scrape timestamp, so pass it rather than re-parsing each path
+                scrape_timestamp = int(timestamp_dir.name) if timestamp_dir.name.isdigit() else None
+
+                # Normalize files in parallel; each domain appears once per timestamp
+                # directory, so workers never write to the same output files
+                futures = {
+                    executor.submit(
+                        normalize_townnews_file,
+                        json_file,
+                        output_dir,
+                        scrape_timestamp=scrape_timestamp,
+                        hash_algorithm=hash_algorithm
+                    ): json_file
+                    for json_file in json_files
+                }
 
-            # Update overall statistics
-            overall_stats["files_processed"] += timestamp_stats["files_processed"]
-            overall_stats["articles_new"] += timestamp_stats["articles_new"]
-            overall_stats["articles_skipped"] += timestamp_stats["articles_skipped"]
-            overall_stats["articles_skipped_image_type"] += timestamp_stats["articles_skipped_image_type"]
-            overall_stats["errors"] += timestamp_stats["errors"]
+                # Report each file as soon as its worker finishes
+                for future in as_completed(futures):
+                    json_file = futures[future]
+                    try:
+                        file_stats = future.result()
+                        print(f"Processed {json_file}")
+
+                        for message in file_stats["messages"]:
+                            print(f"  {message}")
+
+                        timestamp_stats["files_processed"] += 1
+                        timestamp_stats["articles_new"] += file_stats["articles_new"]
+                        timestamp_stats["articles_skipped"] += file_stats["articles_skipped"]
+                        timestamp_stats["articles_skipped_image_type"] += file_stats["articles_skipped_image_type"]
+                        timestamp_stats["errors"] += file_stats["errors"]
+
+                        print(f"  ✓ New: {file_stats['articles_new']}, Skipped: {file_stats['articles_skipped']}, Images: {file_stats['articles_skipped_image_type']}, Errors: {file_stats['errors']}")
+
+                    except Exception as e:
+                        print(f"  ✗ Error processing {json_file}: {e}")
+                        timestamp_stats["errors"] += 1
+
+                # Write summary for this timestamp directory
+                if timestamp_stats["files_processed"] > 0:
+                    summary_path = os.path.join(timestamp_dir.path, "_normalization_summary.json")
+                    summary = {
+                        "timestamp": datetime.now().isoformat(),
+                        "source": "townnews",
+                        "statistics": timestamp_stats
+                    }
+
+                    with _open_buffered(summary_path, 'wb') as f:
+                        f.write(orjson.dumps(summary, option=orjson.OPT_INDENT_2))
+
+                    print(f"  → Summary written to {summary_path}")
+
+                # Update overall statistics
+                overall_stats["files_processed"] += timestamp_stats["files_processed"]
+                overall_stats["articles_new"] += timestamp_stats["articles_new"]
+                overall_stats["articles_skipped"] += timestamp_stats["articles_skipped"]
+                overall_stats["articles_skipped_image_type"] += timestamp_stats["articles_skipped_image_type"]
+                overall_stats["errors"] += timestamp_stats["errors"]
 
     print(f"\n=== Normalization Complete ===")
     print(f"Files processed: {overall_stats['files_processed']}")
@@ -326,5 +657,117 @@ def process_all_raw_data(raw_data_dir="raw_news_data", output_dir="../normalized
     print(f"Errors: {overall_stats['errors']}")
 
 
+def _iter_article_lines(domain_dir):
+    """
+    Yield every stored article for a domain as a single JSON line (bytes ending in a newline),
+    from legacy per-article files followed by the domain's articles.jsonl. An interrupted run
+    can store an article twice, so only the first line for each URL is yielded.
+    """
+    # MD5 digests of the URLs yielded so far (16 bytes each, rather than whole URLs)
+    seen_urls = set()
+
+    def is_new(article):
+        url = article.get("url")
+        if not url:
+            return True
+        digest = hashlib.md5(url.encode('utf-8')).digest()
+        if digest in seen_urls:
+            return False
+        seen_urls.add(digest)
+        return True
+
+    # Legacy one-file-per-article output: re-serialize so each article is on a single line
+    legacy_files = sorted(entry.path for entry in _scan_dir(domain_dir) if entry.name.endswith(".json"))
+    for article_file in legacy_files:
+        with _open_buffered(article_file, 'rb') as f:
+            article = orjson.loads(f.read())
+        if is_new(article):
+            yield orjson.dumps(article) + b"\n"
+
+    articles_path = os.path.join(domain_dir, ARTICLES_FILENAME)
+    if os.path.exists(articles_path):
+        with _open_buffered(articles_path, 'rb') as f:
+            for line in f:
+                # Skip a partial last line left by an interrupted write
+                if line.endswith(b"\n") and is_new(orjson.loads(line)):
+                    yield line
+
+
+def write_shards(output_dir="../normalized_news", shard_dir="../normalized_news_shards", shard_size=SHARD_SIZE):
+    """
+    Repack all normalized articles into equally sized, gzipped JSON Lines shards
+    (normalized_00000.jsonl.gz, normalized_00001.jsonl.gz, ...) so downstream readers
+    can split the work evenly across parallel workers. Shards are rebuilt from scratch
+    in a new hidden directory next to shard_dir, and shard_dir is a symlink that is then
+    atomically repointed to it, so readers always find a complete set. This reads the
+    whole corpus, so it is run on request (python normalize_news.py --shards) rather
+    than after every normalization.
+
+    Args:
+        output_dir: Directory containing the normalized domain subdirectories
+        shard_dir: Path of the symlink to the current set of shards
+        shard_size: Number of articles per shard (default: SHARD_SIZE)
+
+    Returns:
+        Number of shards written
+    """
+    shard_dir = os.path.normpath(shard_dir)
+    parent_dir = os.path.dirname(shard_dir) or "."
+    os.makedirs(parent_dir, exist_ok=True)
+
+    # Build each set in its own directory next to shard_dir, so the symlink can be relative
+    build_dir = tempfile.mkdtemp(prefix=f".{os.path.basename(shard_dir)}_", dir=parent_dir)
+    os.chmod(build_dir, 0o755)
+
+    shard_count = 0
+    shard_file = None
+    articles_in_shard = 0
+
+    try:
+        for domain_dir in sorted(_scan_dir(output_dir), key=lambda entry: entry.name):
+            if not domain_dir.is_dir():
+                continue
+
+            for article_line in _iter_article_lines(domain_dir.path):
+                # Start a new shard when the current one is full
+                if shard_file is None or articles_in_shard >= shard_size:
+                    if shard_file:
+                        shard_file.close()
+                    shard_path = os.path.join(build_dir, f"normalized_{shard_count:05d}.jsonl.gz")
+                    shard_file = gzip.open(shard_path, 'wb', compresslevel=3)
+                    shard_count += 1
+                    articles_in_shard = 0
+
+                shard_file.write(article_line)
+                articles_in_shard += 1
+
+        if shard_file:
+            shard_file.close()
+    except BaseException:
+        # Leave the existing shards untouched if the rebuild fails
+        if shard_file:
+            shard_file.close()
+        shutil.rmtree(build_dir, ignore_errors=True)
+        raise
+
+    # Repoint shard_dir by replacing the symlink (os.replace is atomic), then remove the previous set
+    previous_dir = os.path.realpath(shard_dir) if os.path.islink(shard_dir) else None
+    if previous_dir is None and os.path.isdir(shard_dir):
+        # A plain directory written by an older version can't be swapped atomically; replace it once
+        shutil.rmtree(shard_dir)
+    link_path = build_dir + ".link"
+    os.symlink(os.path.basename(build_dir), link_path)
+    os.replace(link_path, shard_dir)
+    if previous_dir:
+        shutil.rmtree(previous_dir, ignore_errors=True)
+
+    print(f"Shards written: {shard_count} (up to {shard_size} articles each) in {shard_dir}")
+    return shard_count
+
+
 if __name__ == "__main__":
     process_all_raw_data()
+
+    # Rebuilding the shards reads every stored article, so it's opt-in
+    if "--shards" in sys.argv[1:]:
+        write_shards()